@@ -7,7 +7,7 @@
 #   • Developer Playground (HPC, Zonal, OS/MW, SOA, Adaptive‑AUTOSAR,
 #     OTA, Cloud/Edge, Security)
 #   • V&V Engineer page (unit tests, shift‑left)
-#   • SIL & Virtualization demo (multiprocessing)
+#   • SIL & Virtualization demo (threads / multiprocessing)
 #   • Infotainment + OTA (play‑store, app icons, version bump)
 #   • ADAS page (lane‑departure, collision‑warning)
 #   • Inside‑view of the car (interior SVG)
@@ -19,11 +19,35 @@
 # Run:   streamlit run SDV_full_demo.py
 # --------------------------------------------------------------
 
-import unittest                      # global import for the V&V page
-import io                            # capture unittest output
-import os, json, time, multiprocessing as mp
+import io                            # StringIO for report assembly
+import os, json, math, time, tempfile, functools, itertools, queue, threading, multiprocessing as mp
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque, OrderedDict
+from contextlib import contextmanager
 import numpy as np, pandas as pd, streamlit as st
-from datetime import datetime, timedelta
+from datetime import datetime
+from dateutil.tz import tzlocal       # ships with pandas
+try:                                 # optional JIT for the drive kernel
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+try:                                 # optional – only the Security tab needs it
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import rsa, ed25519, padding
+    # built once – shared by every RSA sign/verify click
+    _SHA256 = hashes.SHA256()
+    _PSS_PADDING = padding.PSS(mgf=padding.MGF1(_SHA256),
+                               salt_length=padding.PSS.MAX_LENGTH)
+except ImportError:
+    rsa = None
+try:                                 # optional – faster state serialisation
+    import orjson
+except ImportError:
+    orjson = None
 ##from graphviz import Source          # for flow‑charts
 
 # ------------------------------------------------------------------
@@ -31,6 +55,15 @@ from datetime import datetime, timedelta
 # ------------------------------------------------------------------
 STATE_FILE      = "sdv_state.json"
 MOCK_MQTT_FILE  = "mock_mqtt_latest.json"
+DRIVE_LOG_MAX   = 2000               # rows kept in the rolling drive log
+
+# shared read-only fallback for pages that render before the first drive step
+_DRIVE_DEFAULT = MappingProxyType({"speed": 0.0, "soc": 95.0, "temperature": 30.0,
+                                   "cycles": 0, "mode": "Normal"})
+
+# bound formatters for the ECU / ADAS readouts
+_F1  = "{:.1f}".format
+_FP2 = "{:+.2f}".format
 
 DEFAULT_APPS = [
     {"id":"nav","name":"Navigation","version":"1.0","icon":"🧭",
@@ -49,14 +82,42 @@ STORE_APPS = [
     {"id":"weather","name":"WeatherNow","version":"1.0","icon":"☁️",
      "description":"Local weather"},
 ]
+# read-only catalogue; install_app() stores a plain-dict copy
+STORE_APPS = tuple(MappingProxyType(a) for a in STORE_APPS)
+
+# app-card markup shared by the store and installed-app grids
+_CARD_TPL = """
+    <div class="app-card" style="border:1px solid #e5e7eb;
+         border-radius:10px; padding:8px; margin-bottom:8px;
+         background:#fff;">
+      <div style="display:flex; align-items:center;">
+        <span style="font-size:1.4rem; margin-right:6px;">{icon}</span>
+        <strong>{name}</strong>
+      </div>
+      <p style="font-size:0.85rem; color:#555;">{description}</p>
+      <small>v{version}</small>
+    </div>
+    """
+
+# store cards depend only on static STORE_APPS fields – render them once
+_STORE_CARD_HTML = {a["id"]: _CARD_TPL.format_map(a) for a in STORE_APPS}
+# fallbacks for installed apps saved with missing fields
+_CARD_DEFAULTS = {"icon": "📦", "name": "App", "description": "", "version": ""}
 
 # ------------------------------------------------------------------
 # 1️⃣  Persistent state handling
 # ------------------------------------------------------------------
 def load_state():
+    # re-parse only when the file changed on disk; st.cache_resource
+    # (unlike a module-level cache) survives Streamlit reruns
+    mtime = os.path.getmtime(STATE_FILE) if os.path.exists(STATE_FILE) else 0.0
+    return _load_state_cached(mtime)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_state_cached(mtime):
     if os.path.exists(STATE_FILE):
         try:
-            with open(STATE_FILE) as f:
+            with open(STATE_FILE, "rb") as f:     # UTF-8 from either encoder
                 return json.load(f)
         except Exception:
             pass
@@ -75,90 +136,197 @@ def load_state():
     save_state(state)
     return state
 
+@st.cache_resource(show_spinner=False)
+def _default_file_mode():
+    # os.umask can only be read by setting it – do that once per process
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
 def save_state(state):
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    if orjson is not None:
+        payload = orjson.dumps(state, default=str,
+                               option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(state, separators=(",", ":"),
+                             default=str).encode()
+    # unique temp file per writer – sessions run in separate threads
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(STATE_FILE)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        # mkstemp creates 0600 – keep the mode open(..., "w") would give
+        try:
+            mode = os.stat(STATE_FILE).st_mode & 0o777
+        except FileNotFoundError:
+            mode = _default_file_mode()
+        os.chmod(tmp, mode)
+        os.replace(tmp, STATE_FILE)  # atomic – readers never see half a file
+    except BaseException:
+        os.unlink(tmp)
+        raise
 
 # ------------------------------------------------------------------
 # 2️⃣  Application manager (install / uninstall / OTA)
 # ------------------------------------------------------------------
 class ApplicationManager:
-    def __init__(self, state=None):
+    def __init__(self, state=None, autosave=True):
         self.state = state or load_state()
+        self.autosave = autosave           # False → call flush() yourself
+        self._dirty = False
+        # id → app; state["installed_apps"] (a list on disk) is rebuilt on flush()
+        self._apps = {a["id"]: a for a in self.state.get("installed_apps", [])}
 
     def list_apps(self):
-        return self.state.get("installed_apps", [])
+        return list(self._apps.values())
+
+    def iter_apps(self):
+        """Installed apps in install order, without building a list."""
+        return iter(self._apps.values())
+
+    def installed_id_set(self):
+        """Live, set-like view of installed app ids (no copy)."""
+        return self._apps.keys()
+
+    def _changed(self):
+        self._dirty = True
+        if self.autosave:
+            self.flush()
+
+    def flush(self):
+        """Write the state to disk if anything changed since the last save."""
+        if self._dirty:
+            self.state["installed_apps"] = list(self._apps.values())
+            save_state(self.state)
+            self._dirty = False
+
+    @contextmanager
+    def batch(self):
+        """Group several mutations into a single save_state() on exit."""
+        autosave, self.autosave = self.autosave, False
+        try:
+            yield self
+        finally:
+            self.autosave = autosave
+            self.flush()
 
     def install_app(self, app):
-        ids = {a["id"] for a in self.list_apps()}
-        if app["id"] in ids:
+        if app["id"] in self._apps:
             return False, "already installed"
-        self.state.setdefault("installed_apps", []).append(app.copy())
-        save_state(self.state)
+        self._apps[app["id"]] = app.copy()
+        self._changed()
         return True, "installed"
 
     def uninstall_app(self, app_id):
-        apps = self.list_apps()
-        new = [a for a in apps if a["id"] != app_id]
-        if len(new) == len(apps):
+        if self._apps.pop(app_id, None) is None:
             return False, "not found"
-        self.state["installed_apps"] = new
-        save_state(self.state)
+        self._changed()
         return True, "uninstalled"
 
     def update_app_version(self, app_id, new_version):
-        for a in self.state.setdefault("installed_apps", []):
-            if a["id"] == app_id:
-                a["version"] = new_version
-                save_state(self.state)
-                return True
-        return False
+        a = self._apps.get(app_id)
+        if a is None:
+            return False
+        a["version"] = new_version
+        self._changed()
+        return True
 
 # ------------------------------------------------------------------
 # 3️⃣  Telemetry source & predictive maintenance
 # ------------------------------------------------------------------
+# column dtypes for telemetry frames (float32 halves memory vs float64)
+TELEMETRY_DTYPES = {"voltage": "float32", "current": "float32",
+                    "temperature": "float32", "soc": "float32", "cycles": "int32"}
+# shared generator for unseeded synthetic sensor noise
+_NOISE_RNG = np.random.default_rng()
+
 class TelemetrySource:
+    BUF_POOL_SIZE = 4                # distinct series lengths kept warm
+
+    def __init__(self):
+        # periods → float64 work buffers reused by repeated simulate() calls
+        self._buf_pool = OrderedDict()
+
+    def _buffers(self, periods):
+        bufs = self._buf_pool.pop(periods, None)
+        if bufs is None:
+            bufs = {k: np.empty(periods)
+                    for k in ("voltage", "temperature", "current", "cumabs", "wear")}
+            if len(self._buf_pool) >= self.BUF_POOL_SIZE:
+                self._buf_pool.popitem(last=False)      # evict least recent
+        self._buf_pool[periods] = bufs
+        return bufs
+
     def simulate(self, hours=48, freq_minutes=15, seed=None):
-        if seed is not None:
-            np.random.seed(int(seed))
+        return pd.DataFrame(self._simulate_columns(hours, freq_minutes, seed))
+
+    def _simulate_columns(self, hours, freq_minutes, seed):
+        """Simulated telemetry as a dict of arrays (timestamp column first)."""
+        rng = np.random.default_rng(None if seed is None else int(seed))
         periods = max(2, int(hours * 60 / freq_minutes))
-        now = datetime.now()
-        ts = [now - timedelta(minutes=freq_minutes * i) for i in reversed(range(periods))]
-
-        base_voltage = 400.0
-        drift = np.linspace(0, -5, periods)
-        noise_v = np.random.normal(0, 0.2, periods)
-
-        temp_base = 30.0
-        temp_trend = np.linspace(0, 8, periods) * (np.random.rand() * 1.0)
-        temp_noise = np.random.normal(0, 0.6, periods)
-
-        current = np.clip(np.random.normal(5, 2, periods), -50, 100)
-        soc = np.clip(100 - np.cumsum(np.abs(current)) * 0.001, 10, 100)
-        cycles = np.clip((np.cumsum(np.abs(current)) / 1000).astype(int), 0, 200)
-
-        voltage = base_voltage + drift + noise_v - cycles * 0.01
-        temperature = temp_base + temp_trend + temp_noise + cycles * 0.02
-
-        df = pd.DataFrame({
-            "timestamp": pd.to_datetime(ts),
-            "voltage": voltage,
-            "current": current,
-            "temperature": temperature,
-            "soc": soc,
-            "cycles": cycles,
-        })
-        return df
+        ts = pd.date_range(end=pd.Timestamp.now().floor("s"), periods=periods,
+                           freq=f"{freq_minutes}min")
+
+        # all float work happens in pooled buffers; the dtype casts at the
+        # end copy out of them, so returned arrays never alias the pool
+        bufs = self._buffers(periods)
+
+        # voltage: 400 V base, 5 V linear drift, sensor noise
+        voltage = rng.standard_normal(out=bufs["voltage"])
+        voltage *= 0.2
+        voltage += np.linspace(400.0, 395.0, periods)
+
+        # temperature: 30 °C base, random-strength warming trend, noise
+        temperature = rng.standard_normal(out=bufs["temperature"])
+        temperature *= 0.6
+        temperature += 30.0
+        temperature += np.linspace(0, 8 * rng.random(), periods)
+
+        current = rng.standard_normal(out=bufs["current"])
+        current *= 2.0
+        current += 5.0
+        np.clip(current, -50, 100, out=current)
+        cumabs = np.abs(current, out=bufs["cumabs"])    # shared by soc and cycles
+        np.cumsum(cumabs, out=cumabs)
+        cycles = (cumabs // 1000).astype(np.int32)
+        np.clip(cycles, 0, 200, out=cycles)
+        soc = np.multiply(cumabs, 0.001, out=cumabs)
+        np.subtract(100, soc, out=soc)
+        np.clip(soc, 10, 100, out=soc)
+
+        # cycle wear
+        wear = np.multiply(cycles, 0.01, out=bufs["wear"])
+        voltage -= wear
+        wear *= 2.0
+        temperature += wear
+
+        cols = {"voltage": voltage, "current": current,
+                "temperature": temperature, "soc": soc, "cycles": cycles}
+        return {"timestamp": ts,
+                **{k: v.astype(TELEMETRY_DTYPES[k], copy=False)
+                   for k, v in cols.items()}}
 
     def read_can_csv(self, fileobj):
-        df = pd.read_csv(fileobj)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        return df
+        # peek at the header so dtype/parse_dates only name existing columns
+        cols = pd.read_csv(fileobj, nrows=0).columns
+        fileobj.seek(0)
+        # nullable Int32 for cycles: logged CSVs may have blank cells
+        dtypes = dict(TELEMETRY_DTYPES, cycles="Int32")
+        return pd.read_csv(
+            fileobj, engine="c",
+            dtype={c: t for c, t in dtypes.items() if c in cols},
+            parse_dates=["timestamp"] if "timestamp" in cols else False)
 
     def start_mock_mqtt_publish(self):
-        df = self.simulate(hours=6, freq_minutes=5, seed=99)
+        # only the last 20 rows are published – build them straight from the arrays
+        cols = self._simulate_columns(hours=6, freq_minutes=5, seed=99)
+        ts = cols.pop("timestamp")
+        n = len(ts)
+        latest = [{"timestamp": str(ts[i]),
+                   **{k: v[i].item() for k, v in cols.items()}}
+                  for i in range(max(0, n - 20), n)]
         with open(MOCK_MQTT_FILE, "w") as f:
-            json.dump({"latest": df.tail(20).to_dict(orient="records")}, f, default=str)
+            json.dump({"latest": latest}, f)
 
     def read_mock_mqtt_latest(self):
         if not os.path.exists(MOCK_MQTT_FILE):
@@ -175,10 +343,13 @@ class PredictiveMaintenance:
         if df is None or df.empty:
             return None
         recent = df.tail(12)
-        times = (recent["timestamp"].astype("int64") // 1_000_000_000).values
-        volts = recent["voltage"].values
-        dt = (times[-1] - times[0]) / 3600.0 if len(times) >= 2 else 1.0
-        slope = (volts[-1] - volts[0]) / dt
+        times = recent["timestamp"]
+        volts = recent["voltage"]
+        if len(recent) >= 2:
+            dt = (times.iat[-1] - times.iat[0]).total_seconds() / 3600.0
+        else:
+            dt = 1.0
+        slope = (volts.iat[-1] - volts.iat[0]) / dt
         voltage_drop_rate = -slope if slope < 0 else 0.0
         temp_mean = float(recent["temperature"].mean())
         cycles = int(recent["cycles"].max())
@@ -203,31 +374,23 @@ class PredictiveMaintenance:
 # ------------------------------------------------------------------
 # 4️⃣  Drive‑step simulation (core physics)
 # ------------------------------------------------------------------
-def simulate_drive_step(state, throttle_pct=0.0, brake_pct=0.0,
-                       dt_seconds=1.0, mode="Normal"):
-    s = state.setdefault("drive", {})
-    speed = s.get("speed", 0.0)          # km/h
-    soc = s.get("soc", 95.0)
-    temp = s.get("temperature", 30.0)
-    cycles = s.get("cycles", 0)
+# mode → (accel multiplier, current factor, regen factor)
+_MODE_TABLE = {
+    "Normal": (1.0, 1.0, 1.0),
+    "Eco":    (0.7, 0.7, 1.1),
+    "Sport":  (1.4, 1.3, 0.9),
+    "Snow":   (0.6, 0.8, 1.0),
+    "Regen":  (0.9, 0.9, 1.4),
+}
 
-    # base accelerations (simple linear model)
-    accel = (throttle_pct / 100.0) * 3.5
+def _drive_kernel_py(speed, soc, temp, cycles, throttle_pct, brake_pct,
+                  dt_seconds, accel_mul, cur_factor, regen_factor, regen_mode):
+    """Scalar physics of one drive step.
+    Returns (speed, rpm, current, soc, temp, cycles)."""
+    # base accelerations (simple linear model), scaled by the drive mode
+    accel = (throttle_pct / 100.0) * 3.5 * accel_mul
     decel = (brake_pct / 100.0) * 6.0 + 0.1
 
-    # mode multipliers
-    mode = mode.capitalize()
-    if mode == "Eco":
-        accel *= 0.7; cur_factor = 0.7; regen_factor = 1.1
-    elif mode == "Sport":
-        accel *= 1.4; cur_factor = 1.3; regen_factor = 0.9
-    elif mode == "Snow":
-        accel *= 0.6; cur_factor = 0.8; regen_factor = 1.0
-    elif mode == "Regen":
-        accel *= 0.9; cur_factor = 0.9; regen_factor = 1.4
-    else:   # Normal
-        cur_factor = 1.0; regen_factor = 1.0
-
     # speed update (km/h ↔ m/s)
     speed_ms = speed / 3.6
     speed_ms = max(0.0, speed_ms + (accel - decel) * dt_seconds)
@@ -239,15 +402,54 @@ def simulate_drive_step(state, throttle_pct=0.0, brake_pct=0.0,
     current = base_current * cur_factor
 
     soc_delta = (current * dt_seconds) * 0.0005
-    if mode == "Regen" or (throttle_pct < 20 and brake_pct > 10):
+    if regen_mode or (throttle_pct < 20 and brake_pct > 10):
         soc_delta *= (0.7 / regen_factor)
 
     soc = max(5.0, soc - soc_delta)
     temp = temp + (current * 0.001 * dt_seconds) + (throttle_pct / 100.0) * 0.01
     cycles = min(1000, cycles + int(abs(current) * dt_seconds / 100.0))
+    return speed, rpm, current, soc, temp, cycles
+
+# the script is re-executed on every rerun – wrap the kernel once per
+# server process; numba compiles lazily on the first drive step
+@st.cache_resource(show_spinner=False)
+def _jit_drive_kernel():
+    return njit(cache=True)(_drive_kernel_py)
 
-    ts = datetime.now()
-    row = {"timestamp": ts.isoformat(),
+_drive_kernel = _jit_drive_kernel()
+
+# drive-log rows carry a raw time.time_ns() stamp; format only for display
+_LOCAL_TZ = tzlocal()                # DST-aware, unlike a fixed utcoffset
+
+def _iso(ns):
+    """ISO‑8601 local time for a single time_ns stamp."""
+    return datetime.fromtimestamp(ns / 1e9, _LOCAL_TZ).replace(tzinfo=None).isoformat()
+
+def _ns_to_datetime(ns):
+    """Vectorised _iso: Series of time_ns stamps → naive local datetimes."""
+    return (pd.to_datetime(ns, unit="ns", utc=True)
+              .dt.tz_convert(_LOCAL_TZ).dt.tz_localize(None))
+
+def simulate_drive_step(state, throttle_pct=0.0, brake_pct=0.0,
+                       dt_seconds=1.0, mode="Normal"):
+    s = state.setdefault("drive", {})
+    mode = mode.capitalize()
+    accel_mul, cur_factor, regen_factor = _MODE_TABLE.get(mode, _MODE_TABLE["Normal"])
+    speed, rpm, current, soc, temp, cycles = _drive_kernel(
+        float(s.get("speed", 0.0)),          # km/h
+        float(s.get("soc", 95.0)),
+        float(s.get("temperature", 30.0)),
+        int(s.get("cycles", 0)),
+        float(throttle_pct), float(brake_pct), float(dt_seconds),
+        accel_mul, cur_factor, regen_factor, mode == "Regen")
+
+    # simulated clock: a row is stamped at least dt after the previous one,
+    # so batched steps keep their spacing without wall-clock sleeps
+    cols = state.get("drive_log_cols")
+    now_ns = time.time_ns()
+    if cols and cols["timestamp_ns"]:
+        now_ns = max(now_ns, cols["timestamp_ns"][-1] + int(dt_seconds * 1e9))
+    row = {"timestamp_ns": now_ns,
            "speed": round(float(speed), 2),
            "rpm": int(rpm),
            "current": round(float(current), 3),
@@ -260,26 +462,56 @@ def simulate_drive_step(state, throttle_pct=0.0, brake_pct=0.0,
     s.update({"speed": speed, "soc": soc, "temperature": temp,
               "cycles": cycles, "mode": mode})
 
-    log = state.setdefault("drive_log", [])
-    log.append(row)
-    if len(log) > 2000:
-        del log[:len(log) - 2000]
+    # column-per-field log (one bounded deque per key) so frames are
+    # built from columns instead of reflecting over thousands of row dicts
+    if cols is None:
+        cols = state["drive_log_cols"] = {k: deque(maxlen=DRIVE_LOG_MAX) for k in row}
+    for k, v in row.items():
+        cols[k].append(v)
+    state["drive_tick"] = state.get("drive_tick", 0) + 1
     return row
 
+def _drive_log_df():
+    """Timestamp-indexed drive log; rebuilt only after a new step (read-only)."""
+    tick = st.session_state.get("drive_tick", 0)
+    cached = st.session_state.get("_log_df")
+    if cached is not None and cached[0] == tick:
+        return cached[1]
+    df = pd.DataFrame(st.session_state.get("drive_log_cols", {}))
+    if not df.empty:
+        df["timestamp"] = _ns_to_datetime(df.pop("timestamp_ns"))
+        df = df.set_index("timestamp")
+    st.session_state["_log_df"] = (tick, df)
+    return df
+
 # ------------------------------------------------------------------
 # 5️⃣  ECU snapshot (derived from drive state)
 # ------------------------------------------------------------------
+ECU_CACHE_SIZE = 16                  # snapshots memoised per session
+
 def compute_ecu_snapshot():
-    drive = st.session_state.get(
-        "drive",
-        {"speed": 0.0, "soc": 95.0, "temperature": 30.0,
-         "cycles": 0, "mode": "Normal"},
-    )
-    log = st.session_state.get("drive_log", [])
+    drive = st.session_state.get("drive", _DRIVE_DEFAULT)
+    # drive_tick only moves in simulate_drive_step, so UI-only reruns
+    # return the previous snapshot without rebuilding the key
+    tick = st.session_state.get("drive_tick", 0)
+    last = st.session_state.get("_ecu_last")
+    if last is not None and last[0] == tick:
+        return last[1]
+
+    log = st.session_state.get("drive_log_cols", {}).get("timestamp_ns", ())
     speed = drive["speed"]
     mode = drive["mode"]
     idx = len(log)
 
+    # the snapshot is a pure function of the drive state + log length;
+    # kept in session_state because module globals reset on every rerun
+    cache = st.session_state.setdefault("_ecu_cache", {})
+    key = (speed, mode, drive["temperature"], drive["cycles"], drive["soc"], idx)
+    snap = cache.get(key)
+    if snap is not None:
+        st.session_state["_ecu_last"] = (tick, snap)
+        return snap
+
     # BCM
     bcm = {"headlights_on": (speed < 5) or (idx % 20 >= 10),
            "doors_locked": idx % 7 != 0,
@@ -295,13 +527,18 @@ def compute_ecu_snapshot():
            "signal_strength": max(1, 5 - int((abs(speed - 60) / 60) * 3)),
            "gps_fix": "3D" if speed > 1 else "2D/Static"}
     # ADAS
-    lane_offset = float(np.sin(idx / 15.0) * 0.4)
+    lane_offset = math.sin(idx / 15.0) * 0.4
     adas = {"lane_offset": lane_offset,
             "lane_departure": abs(lane_offset) > 0.3,
             "obstacle_distance": max(5.0, 80.0 - speed * 0.5),
             "collision_warn": speed > 40.0 and max(5.0, 80.0 - speed * 0.5) < 20.0}
-    return {"BCM": bcm, "BMS": bms, "TCU": tcu, "ADAS": adas,
+    snap = {"BCM": bcm, "BMS": bms, "TCU": tcu, "ADAS": adas,
             "meta": {"speed": speed, "mode": mode}}
+    if len(cache) >= ECU_CACHE_SIZE:
+        del cache[next(iter(cache))]      # FIFO eviction
+    cache[key] = snap
+    st.session_state["_ecu_last"] = (tick, snap)
+    return snap
 
 # ------------------------------------------------------------------
 # 6️⃣  SVG assets (car top‑view, infotainment screen, interior)
@@ -365,6 +602,11 @@ def svg_to_html(svg_str, width=None):
     style = f"width:{width}px;" if width else ""
     return f"<div style='display:block; {style}'>{svg_str}</div>"
 
+# wrapped once at import for the sizes the pages render
+CAR_SVG_HTML          = svg_to_html(CAR_SVG, width=480)
+INFOTAINMENT_SVG_HTML = svg_to_html(INFOTAINMENT_SVG, width=320)
+INTERIOR_SVG_HTML     = svg_to_html(INTERIOR_SVG, width=480)
+
 # ------------------------------------------------------------------
 # 7️⃣  Flow‑chart helpers
 # ------------------------------------------------------------------
@@ -426,50 +668,52 @@ def draw_arch_evolution():
 # ------------------------------------------------------------------
 # 8️⃣  OTA helper (progress bar)
 # ------------------------------------------------------------------
+def _bump_version(v):
+    """'1.2' → '1.3', '2' → '2.1'; a non‑numeric last part gets '.1' appended."""
+    head, _, tail = v.rpartition(".")
+    if head and tail.isdigit():
+        return f"{head}.{int(tail) + 1}"
+    return f"{v}.1"
+
 def simulate_ota_update(app_mgr, app_id, seconds=2.0):
     apps = app_mgr.list_apps()
     app = next((a for a in apps if a.get("id") == app_id), None)
     if app is None:
         return False, "app not installed"
 
-    old_version = str(app.get("version", "1.0"))
-    try:
-        parts = [int(p) for p in old_version.split(".")]
-        if len(parts) == 1:
-            parts = [parts[0], 1]
-        else:
-            parts[-1] += 1
-        new_version = ".".join(str(p) for p in parts)
-    except Exception:
-        new_version = old_version + ".1"
+    new_version = _bump_version(str(app.get("version", "1.0")))
 
+    # 6 redraws in total – every widget update is a round‑trip to the browser
     pb = st.progress(0)
     status = st.empty()
-    for i in range(0, 101, 5):
+    for i in range(0, 101, 20):
         pb.progress(i)
         status.text(f"Downloading… {i}%")
-        time.sleep(seconds / 20.0)
-    status.text("Installing…")
-    time.sleep(0.4)
+        time.sleep(seconds / 6.0)
+    slow = seconds >= 1.0
+    if slow:
+        status.text("Installing…")
+        time.sleep(0.4)
 
     ok = app_mgr.update_app_version(app_id, new_version)
     if ok:
         status.success(f"✅ Updated to {new_version}")
         pb.progress(100)
-        time.sleep(0.4)
+        if slow:
+            time.sleep(0.4)
         return True, new_version
     else:
         status.error("Update failed")
         return False, "failed"
 
 # ------------------------------------------------------------------
-# 9️⃣  Global ECU process (picklable – used by SIL demo)
+# 9️⃣  Global ECU worker (picklable – used by SIL demo)
 # ------------------------------------------------------------------
-def ecu_process(q_cmd: mp.Queue, q_resp: mp.Queue):
+def _ecu_loop(recv, send):
     """Simple simulated ECU that receives throttle/brake and returns speed."""
-    speed = 0.0                                    # km/h inside the child
+    speed = 0.0                                    # km/h inside the worker
     while True:
-        cmd = q_cmd.get()
+        cmd = recv()
         if cmd == "STOP":
             break
         throttle = cmd.get("throttle", 0.0)
@@ -480,53 +724,95 @@ def ecu_process(q_cmd: mp.Queue, q_resp: mp.Queue):
         speed_ms = speed / 3.6
         speed_ms = max(0.0, speed_ms + (accel - decel) * 0.1)   # 0.1 s step
         speed = speed_ms * 3.6
-        q_resp.put({"speed": round(speed, 2)})
+        send({"speed": round(speed, 2)})
+
+def ecu_process(conn):
+    """Process entry point – `conn` is the child end of an mp.Pipe."""
+    _ecu_loop(conn.recv, conn.send)
+
+def ecu_thread(cmd_q, resp_q):
+    """Thread entry point – plain queue.Queue objects, nothing is pickled."""
+    _ecu_loop(cmd_q.get, resp_q.put)
+
+def start_ecu(use_process=False):
+    """Start the simulated ECU and return (worker, send, recv);
+    recv(timeout) returns the reply or None on timeout."""
+    if use_process:
+        parent_conn, child_conn = mp.Pipe()
+        worker = mp.Process(target=ecu_process, args=(child_conn,), daemon=True)
+        send = parent_conn.send
+        def recv(timeout):
+            return parent_conn.recv() if parent_conn.poll(timeout) else None
+    else:
+        cmd_q, resp_q = queue.Queue(), queue.Queue()
+        worker = threading.Thread(target=ecu_thread, args=(cmd_q, resp_q), daemon=True)
+        send = cmd_q.put
+        def recv(timeout):
+            try:
+                return resp_q.get(timeout=timeout)
+            except queue.Empty:
+                return None
+    worker.start()
+    return worker, send, recv
+
+def stop_ecu():
+    if "ecu_worker" in st.session_state:
+        st.session_state["ecu_send"]("STOP")
+        st.session_state["ecu_worker"].join()
+    for k in ["ecu_worker", "ecu_send", "ecu_recv", "ecu_is_proc"]:
+        if k in st.session_state:
+            del st.session_state[k]
 
 # ------------------------------------------------------------------
-# 10️⃣  SIL & Virtualisation demo (multiprocessing)
+# 10️⃣  SIL & Virtualisation demo (threads / multiprocessing)
 # ------------------------------------------------------------------
 def sil_virtualization_demo():
     st.header("🔄 SIL & Virtualisation Demo")
     st.info(
         """
         *Software‑in‑the‑Loop (SIL)* – the host runs the **vehicle model**.  
-        *Hardware‑in‑the‑Loop (HIL)* – an ECU runs in a **separate process**, communicating via queues.  
-        This mimics a lightweight container/VM isolation.
+        *Hardware‑in‑the‑Loop (HIL)* – an ECU runs in a **separate thread or process**, exchanging one message per command.  
+        The process option mimics a lightweight container/VM isolation; the thread option avoids process start‑up and pickling.
         """
     )
-    # Create queues (only once, stored in session_state)
-    if "ecu_proc" not in st.session_state:
-        cmd_q  = mp.Queue()
-        resp_q = mp.Queue()
-        proc = mp.Process(target=ecu_process, args=(cmd_q, resp_q), daemon=True)
-        proc.start()
-        st.session_state["ecu_proc"] = proc
-        st.session_state["cmd_q"]   = cmd_q
-        st.session_state["resp_q"]  = resp_q
+    isolation = st.radio("ECU isolation", ["Thread (in‑process)", "Process (multiprocessing)"],
+                         horizontal=True, key="sil_isolation")
+    use_process = isolation.startswith("Process")
+    if st.session_state.get("ecu_is_proc", use_process) != use_process:
+        stop_ecu()                               # isolation mode switched
+
+    # Start the ECU worker (only once, stored in session_state)
+    if "ecu_worker" not in st.session_state:
+        worker, send, recv = start_ecu(use_process)
+        st.session_state["ecu_worker"] = worker
+        st.session_state["ecu_send"]   = send
+        st.session_state["ecu_recv"]   = recv
+        st.session_state["ecu_is_proc"] = use_process
 
     # UI to send commands
     throttle = st.slider("Throttle (%)", 0, 100, 0, key="sil_throttle")
     brake    = st.slider("Brake (%)",    0, 100, 0, key="sil_brake")
     if st.button("Send command to ECU (SIL)"):
-        st.session_state["cmd_q"].put({"throttle": throttle, "brake": brake})
-        try:
-            resp = st.session_state["resp_q"].get(timeout=1.0)
+        st.session_state["ecu_send"]({"throttle": throttle, "brake": brake})
+        resp = st.session_state["ecu_recv"](1.0)
+        if resp is not None:
             st.success(f"ECU reported **speed = {resp['speed']} km/h**")
-        except Exception:
+        else:
             st.error("No response from ECU (timeout)")
 
     # Optional clean‑up
-    if st.button("Terminate ECU process (debug)"):
-        st.session_state["cmd_q"].put("STOP")
-        st.session_state["ecu_proc"].join()
-        st.success("ECU process stopped – next visit will restart it.")
-        for k in ["ecu_proc", "cmd_q", "resp_q"]:
-            if k in st.session_state:
-                del st.session_state[k]
+    if st.button("Terminate ECU worker (debug)"):
+        stop_ecu()
+        st.success("ECU worker stopped – next visit will restart it.")
 
 # ------------------------------------------------------------------
 # 11️⃣  Developer Playground – mini‑demos for each core concept
 # ------------------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def _keygen_pool():
+    # one executor per server process; OpenSSL drops the GIL during keygen
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="keygen")
+
 def developer_playground():
     st.header("👨‍💻 Developer Playground – SDV Core Concepts")
     tabs = st.tabs([
@@ -626,7 +912,7 @@ def run_scheduler(runtime_s):
         if "ad_runtime" not in st.session_state:
             ar = AdaptiveRuntime()
             def get_vehicle_speed():
-                drv = st.session_state.get("drive", {"speed":0.0})
+                drv = st.session_state.get("drive", _DRIVE_DEFAULT)
                 return {"speed_kmh": drv["speed"]}
             ar.register_service("VehicleSpeed", get_vehicle_speed)
             st.session_state["ad_runtime"] = ar
@@ -661,56 +947,89 @@ def run_scheduler(runtime_s):
     with tabs[6]:
         st.subheader("☁️ Cloud & Edge Computing Integration")
         if st.button("Upload latest drive telemetry to cloud (simulated)"):
-            telemetry = pd.DataFrame(st.session_state.get("drive_log", []))
-            if telemetry.empty:
+            cols = st.session_state.get("drive_log_cols", {})
+            keys = list(cols)
+            raw = [dict(zip(keys, vals)) for vals in zip(*cols.values())]
+            if not raw:
                 st.warning("No drive data yet.")
             else:
-                state["cloud_telemetry"] = telemetry.to_dict("records")
+                # export with readable timestamps; the live log keeps raw ns
+                state["cloud_telemetry"] = [
+                    dict(r, timestamp=_iso(r["timestamp_ns"])) for r in raw]
                 save_state(state)
-                st.success(f"🚀 Uploaded {len(telemetry)} samples to simulated cloud")
+                st.success(f"🚀 Uploaded {len(raw)} samples to simulated cloud")
         if st.button("Download latest AI model from cloud (simulated)"):
-            model_ver = state.get("cloud_model_version", "1.0")
-            parts = [int(p) for p in model_ver.split(".")]
-            parts[-1] += 1
-            new_ver = ".".join(str(p) for p in parts)
+            new_ver = _bump_version(state.get("cloud_model_version", "1.0"))
             state["cloud_model_version"] = new_ver
             save_state(state)
             st.success(f"⬇️ Downloaded AI model v{new_ver}")
 
     # 8️⃣ Security --------------------------------------------
     with tabs[7]:
-        st.subheader("🔐 Security & Signing (RSA‑2048)")
-        if "private_key" not in st.session_state:
-            if st.button("Generate RSA‑2048 key pair"):
-                from cryptography.hazmat.primitives.asymmetric import rsa
-                from cryptography.hazmat.primitives import hashes
-                from cryptography.hazmat.primitives.asymmetric import padding
-                private_key = rsa.generate_private_key(public_exponent=65537,
-                                                      key_size=2048)
-                st.session_state["private_key"] = private_key
-                st.session_state["public_key"] = private_key.public_key()
-                st.success("🔑 Key pair generated")
+        st.subheader("🔐 Security & Signing (RSA‑PSS / Ed25519)")
+        if rsa is None:
+            st.error("This demo needs the `cryptography` package (pip install cryptography).")
+        elif "_keygen_fut" in st.session_state:
+            fut = st.session_state["_keygen_fut"]
+            if fut.done():
+                del st.session_state["_keygen_fut"]
+                try:
+                    private_key = fut.result()
+                except Exception as e:
+                    st.error(f"❌ Key generation failed: {e}")
+                else:
+                    public_key = private_key.public_key()
+                    st.session_state["private_key"] = private_key
+                    st.session_state["public_key"] = public_key
+                    # bind once: (msg) -> sig and (sig, msg) -> None for either key type
+                    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+                        st.session_state["_sign_fn"] = private_key.sign
+                        st.session_state["_verify_fn"] = public_key.verify
+                    else:
+                        st.session_state["_sign_fn"] = functools.partial(
+                            private_key.sign, padding=_PSS_PADDING, algorithm=_SHA256)
+                        st.session_state["_verify_fn"] = functools.partial(
+                            public_key.verify, padding=_PSS_PADDING, algorithm=_SHA256)
+                    st.success("🔑 Key pair generated")
+            else:
+                st.info("⏳ Generating key pair in the background…")
+                time.sleep(0.2)
+                st.rerun()
+        elif "private_key" not in st.session_state:
+            algo = st.radio("Key type", ["RSA", "Ed25519 (fast keygen)"],
+                            horizontal=True, key="sec_algo")
+            if algo == "RSA":
+                key_bits = st.selectbox("Key size (demo)", [1024, 2048], index=1,
+                                        format_func=lambda b: f"{b} bit" + (
+                                            " – fast demo, not secure" if b < 2048 else ""),
+                                        key="sec_key_bits")
+            if st.button("Generate key pair"):
+                if algo.startswith("Ed25519"):
+                    fut = _keygen_pool().submit(ed25519.Ed25519PrivateKey.generate)
+                else:
+                    fut = _keygen_pool().submit(rsa.generate_private_key,
+                                                public_exponent=65537,
+                                                key_size=key_bits)
+                st.session_state["_keygen_fut"] = fut
+                st.rerun()
         else:
             msg = st.text_area("Message to sign", "SDV demo message")
+            cached = st.session_state.get("_msg_cache", (None, None))
+            if cached[0] != msg:
+                cached = (msg, msg.encode())
+                st.session_state["_msg_cache"] = cached
+            msg_bytes = cached[1]
             if st.button("Sign message"):
-                private_key = st.session_state["private_key"]
-                signature = private_key.sign(
-                    msg.encode(),
-                    padding.PSS(mgf=padding.MGF1(hashes.SHA256()),
-                                 salt_length=padding.PSS.MAX_LENGTH),
-                    hashes.SHA256())
+                signature = st.session_state["_sign_fn"](msg_bytes)
+                sig_hex = signature.hex()
                 st.session_state["signature"] = signature
                 st.success("✍️ Message signed")
-                st.code(signature.hex())
+                st.code(sig_hex[:80] + ("…" if len(sig_hex) > 80 else ""))
+                with st.expander("Full signature hex"):
+                    st.code(sig_hex)
             if "signature" in st.session_state and st.button("Verify signature"):
-                public_key = st.session_state["public_key"]
                 try:
-                    public_key.verify(
-                        st.session_state["signature"],
-                        msg.encode(),
-                        padding.PSS(mgf=padding.MGF1(hashes.SHA256()),
-                                    salt_length=padding.PSS.MAX_LENGTH),
-                        hashes.SHA256())
+                    st.session_state["_verify_fn"](st.session_state["signature"], msg_bytes)
                     st.success("✅ Signature VALID")
                 except Exception as e:
                     st.error(f"❌ Verification failed: {e}")
@@ -726,35 +1045,24 @@ def build_scenario_report(scenario, answers):
     `answers` is a dict with keys like "<scenario_id>_<metric_name>" plus
     free-text fields "<scenario_id>_obs", "_interpret", "_recommend".
     """
-    md = f"# Scenario {scenario['id']}: {scenario['title']}\n\n"
-    md += "## Objective\n"
-    md += f"{scenario['objective']}\n\n"
+    aget = answers.get
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# Scenario {scenario['id']}: {scenario['title']}\n\n")
+    w(f"## Objective\n{scenario['objective']}\n\n")
 
-    md += "## Steps (as performed)\n"
+    w("## Steps (as performed)\n")
     for i, step in enumerate(scenario["steps"], start=1):
-        md += f"{i}. {step}\n"
-    md += "\n"
+        w(f"{i}. {step}\n")
 
-    md += "## Collected Metrics\n"
-    for metric in scenario["metrics"]:
-        key = f"{scenario['id']}_{metric['name']}"
-        value = answers.get(key, "")
-        md += f"- **{metric['label']}** : {value} {metric.get('unit','')}\n"
-    md += "\n"
+    w("\n## Collected Metrics\n")
+    for m, key in zip(scenario["metrics"], scenario["_metric_keys"]):
+        w(f"- **{m['label']}** : {aget(key, '')} {m.get('unit','')}\n")
 
-    obs_key = f"{scenario['id']}_obs"
-    int_key = f"{scenario['id']}_interpret"
-    rec_key = f"{scenario['id']}_recommend"
-
-    md += "## Observations / Anomalies\n"
-    md += f"{answers.get(obs_key, '')}\n\n"
-
-    md += "## Interpretation (Tier‑1 view)\n"
-    md += f"{answers.get(int_key, '')}\n\n"
-
-    md += "## Recommendations / Next Steps\n"
-    md += f"{answers.get(rec_key, '')}\n"
-    return md
+    w(f"\n## Observations / Anomalies\n{aget(scenario['_obs_key'], '')}\n\n")
+    w(f"## Interpretation (Tier‑1 view)\n{aget(scenario['_int_key'], '')}\n\n")
+    w(f"## Recommendations / Next Steps\n{aget(scenario['_rec_key'], '')}\n")
+    return buf.getvalue()
 
 
 # --------------------------------------------------------------
@@ -985,48 +1293,25 @@ EASY_SCENARIOS = [
     },
 ]
 
+# widget / answer keys are fixed per scenario – build them once
+for sc in (*SCENARIOS, *EASY_SCENARIOS):
+    sid = sc["id"]
+    sc["_metric_keys"] = tuple(f"{sid}_{m['name']}" for m in sc["metrics"])
+    sc["_obs_key"] = f"{sid}_obs"
+    sc["_int_key"] = f"{sid}_interpret"
+    sc["_rec_key"] = f"{sid}_recommend"
+del sc, sid
+
+# the catalogues are read-only from here on
+SCENARIOS = tuple(MappingProxyType(sc) for sc in SCENARIOS)
+EASY_SCENARIOS = tuple(MappingProxyType(sc) for sc in EASY_SCENARIOS)
+
 
 # --------------------------------------------------------------
 #  Scenarios & Report page (Easy + Advanced + Examples)
 # --------------------------------------------------------------
-def scenarios_page():
-    """🧩 Scenarios & Report – trainer‑driven challenges (easy + advanced)."""
-    st.header("🧩 Scenarios & Report – Tier 1 Challenges")
-    st.caption(
-        """
-        Each box below describes a real‑world SDV use case.
-        Follow the *Steps* in the app, fill the fields with the numbers you obtain,
-        add short observations/interpretations, then click **Generate report**.
-        The generated **Markdown** file can be downloaded and later submitted.
-        """
-    )
-
-    # Difficulty selector
-    difficulty = st.radio(
-        "Choose difficulty level:",
-        ["Easy scenarios (beginner)", "Advanced scenarios (Tier‑1)"],
-        horizontal=True,
-    )
-
-    # Example walkthrough
-    with st.expander("📌 Example – How a scenario works (with sample report)"):
-        st.markdown(
-            """
-### Step 1 – Run the scenario in the app
-For example:  
-*Driving Dashboard → Mode = Normal, Throttle = 40%, 10 steps, 0.5 s each.*
-
-### Step 2 – Enter the metrics
-Copy the Peak Speed and SOC values into the **Collected metrics** fields.
-Write 2–3 short sentences in **Observations**, **Interpretation** and **Recommendations**.
-
-### Step 3 – Generate the markdown
-Click **Generate report** – the app builds a ready‑to‑submit `.md` file.
-Below is what a simple report could look like:
-"""
-        )
-        st.code(
-            """# Scenario 1: Basic Drive & SOC Drop
+# sample report shown in the walkthrough + blank template offered for download
+_SCENARIO_EXAMPLE_MD = """# Scenario 1: Basic Drive & SOC Drop
 
 ## Objective
 Understand how speed and battery SOC change during a simple drive.
@@ -1044,14 +1329,9 @@ Higher throttle and more aggressive drive modes will increase energy usage. Even
 
 ## Recommendations / Next Steps
 Repeat the test in Sport mode and compare SOC drop and peak speed.
-""",
-            language="markdown",
-        )
-
-    st.markdown("---")
+"""
 
-    # Template download – for participants who prefer to work offline
-    template_md = """# Scenario X – <Title>
+_SCENARIO_TEMPLATE_MD = """# Scenario X – <Title>
 
 ## Objective
 <Write the objective in your own words.>
@@ -1075,9 +1355,51 @@ Repeat the test in Sport mode and compare SOC drop and peak speed.
 ## Recommendations / Next Steps
 <Free‑text>
 """
+
+def scenarios_page():
+    """🧩 Scenarios & Report – trainer‑driven challenges (easy + advanced)."""
+    st.header("🧩 Scenarios & Report – Tier 1 Challenges")
+    st.caption(
+        """
+        Each box below describes a real‑world SDV use case.
+        Follow the *Steps* in the app, fill the fields with the numbers you obtain,
+        add short observations/interpretations, then click **Generate report**.
+        The generated **Markdown** file can be downloaded and later submitted.
+        """
+    )
+
+    # Difficulty selector
+    difficulty = st.radio(
+        "Choose difficulty level:",
+        ["Easy scenarios (beginner)", "Advanced scenarios (Tier‑1)"],
+        horizontal=True,
+    )
+
+    # Example walkthrough
+    with st.expander("📌 Example – How a scenario works (with sample report)"):
+        st.markdown(
+            """
+### Step 1 – Run the scenario in the app
+For example:  
+*Driving Dashboard → Mode = Normal, Throttle = 40%, 10 steps, 0.5 s each.*
+
+### Step 2 – Enter the metrics
+Copy the Peak Speed and SOC values into the **Collected metrics** fields.
+Write 2–3 short sentences in **Observations**, **Interpretation** and **Recommendations**.
+
+### Step 3 – Generate the markdown
+Click **Generate report** – the app builds a ready‑to‑submit `.md` file.
+Below is what a simple report could look like:
+"""
+        )
+        st.code(_SCENARIO_EXAMPLE_MD, language="markdown")
+
+    st.markdown("---")
+
+    # Template download – for participants who prefer to work offline
     st.download_button(
         label="📥 Download empty report template (Markdown)",
-        data=template_md,
+        data=_SCENARIO_TEMPLATE_MD,
         file_name="scenario_template.md",
         mime="text/markdown",
     )
@@ -1087,8 +1409,16 @@ Repeat the test in Sport mode and compare SOC drop and peak speed.
     # Pick scenario set based on difficulty
     scenarios = EASY_SCENARIOS if "Easy" in difficulty else SCENARIOS
 
+    # only the picked scenarios register their form widgets
+    titles = {s["id"]: f"Scenario {s['id']}: {s['title']}" for s in scenarios}
+    active_ids = st.multiselect("Show scenarios", list(titles),
+                                default=[scenarios[0]["id"]],
+                                format_func=titles.get)
+
     # Loop over each scenario and present a form
     for sc in scenarios:
+        if sc["id"] not in active_ids:
+            continue
         with st.expander(f"Scenario {sc['id']}: {sc['title']}"):
             st.subheader("Objective")
             st.write(sc["objective"])
@@ -1100,17 +1430,17 @@ Repeat the test in Sport mode and compare SOC drop and peak speed.
             # ------- FORM ----------
             with st.form(key=f"form_{sc['id']}"):
                 st.subheader("Collected Metrics")
-                # generate a widget for each metric
-                for met in sc["metrics"]:
-                    widget_key = f"{sc['id']}_{met['name']}"
-                    st.text_input(
-                        f"{met['label']} ({met.get('unit','')})",
-                        key=widget_key,
-                    )
+                # generate a widget for each metric, three per row
+                mets = tuple(zip(sc["metrics"], sc["_metric_keys"]))
+                for row_start in range(0, len(mets), 3):
+                    for col, (met, widget_key) in zip(st.columns(3),
+                                                      mets[row_start:row_start + 3]):
+                        col.text_input(
+                            f"{met['label']} ({met.get('unit','')})",
+                            key=widget_key,
+                        )
 
-                obs_key = f"{sc['id']}_obs"
-                int_key = f"{sc['id']}_interpret"
-                rec_key = f"{sc['id']}_recommend"
+                obs_key, int_key, rec_key = sc["_obs_key"], sc["_int_key"], sc["_rec_key"]
 
                 st.subheader("Observations / Anomalies")
                 st.text_area("Free‑text", key=obs_key, height=80)
@@ -1124,14 +1454,11 @@ Repeat the test in Sport mode and compare SOC drop and peak speed.
                 submitted = st.form_submit_button("📝 Generate report")
                 if submitted:
                     # gather the answers
-                    answers = {}
-                    for met in sc["metrics"]:
-                        answers[f"{sc['id']}_{met['name']}"] = st.session_state.get(
-                            f"{sc['id']}_{met['name']}", ""
-                        )
-                    answers[obs_key] = st.session_state.get(obs_key, "")
-                    answers[int_key] = st.session_state.get(int_key, "")
-                    answers[rec_key] = st.session_state.get(rec_key, "")
+                    sget = st.session_state.get
+                    answers = {k: sget(k, "") for k in sc["_metric_keys"]}
+                    answers[obs_key] = sget(obs_key, "")
+                    answers[int_key] = sget(int_key, "")
+                    answers[rec_key] = sget(rec_key, "")
 
                     markdown_report = build_scenario_report(sc, answers)
 
@@ -1222,18 +1549,22 @@ def vver_page():
     def square(x: int) -> int:
         return x * x
 
-    class TestSquare(unittest.TestCase):
-        def test_positive(self): self.assertEqual(square(3), 9)
-        def test_zero(self):     self.assertEqual(square(0), 0)
-        def test_negative(self): self.assertEqual(square(-4), 16)
+    # (name, check) pairs – three known asserts don't need the unittest machinery
+    tests = [("test_positive", lambda: square(3) == 9),
+             ("test_zero",     lambda: square(0) == 0),
+             ("test_negative", lambda: square(-4) == 16)]
+
+    def run_check(fn):
+        try:
+            return fn()
+        except Exception:
+            return False
 
     if st.button("Run V&V unit‑tests"):
-        suite = unittest.TestLoader().loadTestsFromTestCase(TestSquare)
-        buf = io.StringIO()
-        runner = unittest.TextTestRunner(stream=buf, verbosity=2)
-        result = runner.run(suite)
-        st.code(buf.getvalue(), language="text")
-        if result.wasSuccessful():
+        results = [(name, run_check(fn)) for name, fn in tests]
+        st.code("\n".join(f"{name} ... {'ok' if ok else 'FAIL'}"
+                          for name, ok in results), language="text")
+        if all(ok for _, ok in results):
             st.success("✅ All tests passed")
         else:
             st.error("❌ Some tests failed")
@@ -1261,13 +1592,15 @@ def adas_page():
     )
     ecu = compute_ecu_snapshot()
     adas = ecu["ADAS"]
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Lane offset (m)", f"{adas['lane_offset']:+.2f}")
-        st.metric("Lane departure", "YES" if adas["lane_departure"] else "NO")
-    with col2:
-        st.metric("Obstacle distance (m)", f"{adas['obstacle_distance']:.1f}")
-        st.metric("Collision warning", "⚠️" if adas["collision_warn"] else "OK")
+    # one table payload instead of four metric widgets
+    st.dataframe(pd.DataFrame({
+        "Metric": ["Lane offset (m)", "Lane departure",
+                   "Obstacle distance (m)", "Collision warning"],
+        "Value": [_FP2(adas["lane_offset"]),
+                  "YES" if adas["lane_departure"] else "NO",
+                  _F1(adas["obstacle_distance"]),
+                  "⚠️" if adas["collision_warn"] else "OK"],
+    }), hide_index=True)
     st.caption("Values are synthesized from the same simple vehicle model used by the Driving Dashboard.")
 
 # ------------------------------------------------------------------
@@ -1282,94 +1615,90 @@ def interior_view_page():
         """
     )
     # Show the interior SVG
-    st.markdown(svg_to_html(INTERIOR_SVG, width=480), unsafe_allow_html=True)
+    st.markdown(INTERIOR_SVG_HTML, unsafe_allow_html=True)
 
     # Show current speed / mode as it would appear on the speedometer
-    drv = st.session_state.get(
-        "drive",
-        {"speed":0.0,"soc":95.0,"temperature":30.0,"mode":"Normal"},
-    )
-    st.metric("Current speed (km/h)", f"{drv['speed']:.1f}")
-    st.metric("Current mode", drv["mode"])
+    drv = st.session_state.get("drive", _DRIVE_DEFAULT)
+    st.dataframe(pd.DataFrame({
+        "Metric": ["Current speed (km/h)", "Current mode"],
+        "Value": [f"{drv['speed']:.1f}", drv["mode"]],
+    }), hide_index=True)
 
 # ------------------------------------------------------------------
 # 16️⃣  Infotainment & OTA page (play‑store + in‑vehicle UI)
 # ------------------------------------------------------------------
+# app tile positions on the 320 px infotainment screen
+_SLOTS = ((28, 92), (126, 92), (224, 92), (28, 168), (126, 168), (224, 168))
+_SLOT_FILLED = """
+                <div style='position:absolute; left:{x}px; top:{y}px;
+                            width:80px; height:60px; border-radius:8px;
+                            background:#fff; box-shadow:0 2px 6px rgba(0,0,0,0.15);
+                            display:flex; flex-direction:column; align-items:center;
+                            justify-content:center; font-family:sans-serif; text-align:center;'>
+                  <div style='font-size:20px'>{icon}</div>
+                  <div style='font-size:11px; margin-top:4px'>{name}</div>
+                  <div style='font-size:9px; color:#444'>v{version}</div>
+                </div>
+                """
+_SLOT_EMPTY = "<div style='position:absolute; left:{x}px; top:{y}px; width:80px; height:60px;'></div>"
+
+def _render_infotainment_grid_html(apps_sig):
+    """Slot-grid overlay for up to 6 apps given as (id, name, icon, version)."""
+    parts = ["<div style='position:relative; left:0; top:-220px; width:320px;'>"]
+    for i, (x, y) in enumerate(_SLOTS):
+        if i < len(apps_sig):
+            _, name, icon, version = apps_sig[i]
+            parts.append(_SLOT_FILLED.format(x=x, y=y, icon=icon, name=name, version=version))
+        else:
+            parts.append(_SLOT_EMPTY.format(x=x, y=y))
+    parts.append("</div>")
+    return "".join(parts)
+
 def infotainment_ota_page():
     st.header("📱 Infotainment & OTA – App Store + In‑Vehicle UI")
     st.subheader("🛒 Play Store – install demo apps")
     cols = st.columns(3)
-    installed_ids = {a["id"] for a in app_mgr.list_apps()}
-    for i, app in enumerate(STORE_APPS):
-        with cols[i % 3]:
-            st.markdown(
-                f"""
-                <div class="app-card" style="border:1px solid #e5e7eb;
-                     border-radius:10px; padding:8px; margin-bottom:8px;
-                     background:#fff;">
-                  <div style="display:flex; align-items:center;">
-                    <span style="font-size:1.4rem; margin-right:6px;">{app['icon']}</span>
-                    <strong>{app['name']}</strong>
-                  </div>
-                  <p style="font-size:0.85rem; color:#555;">{app['description']}</p>
-                  <small>v{app['version']}</small>
-                </div>
-                """, unsafe_allow_html=True)
-            if app["id"] in installed_ids:
-                st.button("Installed ✓", key=f"inf_inst_{app['id']}", disabled=True)
-            else:
-                if st.button("Install", key=f"inf_inst_{app['id']}"):
-                    ok, msg = app_mgr.install_app(app)
-                    if ok:
-                        st.success(f"{app['name']} installed")
-                        st.rerun()
-                    else:
-                        st.error(msg)
+    installed_ids = app_mgr.installed_id_set()
+    for col, group in zip(cols, (STORE_APPS[i::3] for i in range(3))):
+        with col:
+            for app in group:
+                st.markdown(_STORE_CARD_HTML[app["id"]], unsafe_allow_html=True)
+                if app["id"] in installed_ids:
+                    st.button("Installed ✓", key=f"inf_inst_{app['id']}", disabled=True)
+                else:
+                    if st.button("Install", key=f"inf_inst_{app['id']}"):
+                        ok, msg = app_mgr.install_app(app)
+                        if ok:
+                            st.success(f"{app['name']} installed")
+                            st.rerun()
+                        else:
+                            st.error(msg)
 
     st.markdown("---")
     st.subheader("🚗 Vehicle‑side view")
     col_left, col_right = st.columns([2, 1])
     with col_left:
-        st.markdown(svg_to_html(CAR_SVG, width=480), unsafe_allow_html=True)
-        drv = st.session_state.get(
-            "drive",
-            {"speed":0.0,"soc":95.0,"temperature":30.0,"mode":"Normal"},
-        )
+        st.markdown(CAR_SVG_HTML, unsafe_allow_html=True)
+        drv = st.session_state.get("drive", _DRIVE_DEFAULT)
         st.metric("Speed (km/h)", f"{drv['speed']:.1f}")
         st.metric("SOC (%)", f"{drv['soc']:.2f}")
         st.metric("Battery Temp (°C)", f"{drv['temperature']:.1f}")
         st.metric("Mode", drv["mode"])
     with col_right:
-        st.markdown(svg_to_html(INFOTAINMENT_SVG, width=320), unsafe_allow_html=True)
+        st.markdown(INFOTAINMENT_SVG_HTML, unsafe_allow_html=True)
         # Up to 6 installed apps on the infotainment grid
-        apps = app_mgr.list_apps()[:6]
-        slots = [(28,92),(126,92),(224,92),(28,168),(126,168),(224,168)]
-        html = "<div style='position:relative; left:0; top:-220px; width:320px;'>"
-        for i, (x, y) in enumerate(slots):
-            if i < len(apps):
-                a = apps[i]
-                html += f"""
-                <div style='position:absolute; left:{x}px; top:{y}px;
-                            width:80px; height:60px; border-radius:8px;
-                            background:#fff; box-shadow:0 2px 6px rgba(0,0,0,0.15);
-                            display:flex; flex-direction:column; align-items:center;
-                            justify-content:center; font-family:sans-serif; text-align:center;'>
-                  <div style='font-size:20px'>{a.get('icon','📦')}</div>
-                  <div style='font-size:11px; margin-top:4px'>{a.get('name','')}</div>
-                  <div style='font-size:9px; color:#444'>v{a.get('version','')}</div>
-                </div>
-                """
-            else:
-                html += f"<div style='position:absolute; left:{x}px; top:{y}px; width:80px; height:60px;'></div>"
-        html += "</div>"
-        st.markdown(html, unsafe_allow_html=True)
+        apps = list(itertools.islice(app_mgr.iter_apps(), 6))
+        apps_sig = tuple((a["id"], a.get("name", ""), a.get("icon", "📦"),
+                          a.get("version", "")) for a in apps)
+        st.markdown(_render_infotainment_grid_html(apps_sig), unsafe_allow_html=True)
 
         st.markdown("---")
         st.subheader("🛠️ OTA update from the infotainment screen")
         if apps:
             sel = st.selectbox(
                 "Select an installed app to OTA‑update",
-                [f"{a['name']} ({a['id']}) – v{a['version']}" for a in apps],
+                [f"{name} ({app_id}) – v{version}"
+                 for app_id, name, _, version in apps_sig],
                 key="inf_ota_sel")
             app_id = sel.split("(")[1].split(")")[0]
             if st.button("Start OTA (demo)"):
@@ -1385,11 +1714,10 @@ def infotainment_ota_page():
 # ------------------------------------------------------------------
 # 17️⃣  Docs page – all theory you requested
 # ------------------------------------------------------------------
-def docs_page():
-    st.header("📖 Documentation – All SDV Topics")
-    st.subheader("🔎 SDV – Definition & Perspectives")
-    st.markdown(
-        """
+# (subheader, markdown) sections of the Docs page
+_DOCS_SECTIONS = (
+    ("🔎 SDV – Definition & Perspectives",
+     """
         **Software‑Defined Vehicle (SDV)** – a vehicle whose functions are realised as **software services** running on a **central high‑performance compute platform** and delivered/updated via an **over‑the‑air (OTA)** mechanism.  
         It replaces the classic “many ECUs, many wires” paradigm with a **service‑oriented, cloud‑connected** architecture.
 
@@ -1398,11 +1726,9 @@ def docs_page():
         * **V&V Engineer:** builds SIL/HIL rigs, runs automated unit‑tests, validates functional safety (ISO‑26262).  
         * **OEM:** defines zone layout, Ethernet‑TSN backbone, decides which functions stay on dedicated ECUs vs migrate to the central compute.  
         * **Customer:** sees a **car‑app store**, can install new features like a smartphone.
-        """
-    )
-    st.subheader("💡 Why SDV is needed & benefits")
-    st.markdown(
-        """
+        """),
+    ("💡 Why SDV is needed & benefits",
+     """
         | Benefit | Explanation |
         |---------|-------------|
         | **Reduced wiring & weight** | One Ethernet backbone replaces dozens of CAN/LIN lines. |
@@ -1410,11 +1736,9 @@ def docs_page():
         | **Scalable compute** | Central HPC can host many workloads (ADAS, infotainment, V2X). |
         | **Continuous improvement** | AI models are updated from the cloud, improving safety/performance over the vehicle’s lifetime. |
         | **Better data & analytics** | Telemetry streams enable predictive maintenance, fleet optimisation. |
-        """
-    )
-    st.subheader("🧱 SDV ecosystem components")
-    st.markdown(
-        """
+        """),
+    ("🧱 SDV ecosystem components",
+     """
         1. **Sensors** – cameras, radar, LiDAR, ultrasonic, GPS.  
         2. **High‑Performance Compute (HPC / Edge‑AI)** – GPU/CPU/TPU, runs perception, path‑planning.  
         3. **Zonal Architecture** – physical zones (front, rear, power) connected via high‑speed Ethernet/TSN.  
@@ -1423,105 +1747,81 @@ def docs_page():
         6. **Play‑Store & Infotainment** – user‑facing app marketplace; OTA updates occur per app.  
         7. **Cloud & Edge** – fleet management, OTA server, AI‑model training, data lake.  
         8. **Cybersecurity Framework** – signed OTA, secure boot, ISO‑SAE 21434 compliance.  
-        """
-    )
-    st.subheader("🚀 Approaches to achieve SDV")
-    st.markdown(
-        """
+        """),
+    ("🚀 Approaches to achieve SDV",
+     """
         * **Do I need Adaptive AUTOSAR?** – If you need a standardized service‑oriented runtime, Adaptive AUTOSAR gives you a compliant middleware (SOME/IP, time sync).  
         * **Shift‑North** – Move compute north (up) from the ECU level to the central compute, while still keeping safety‑critical functions on dedicated hardware if required.  
         * **AI‑driven processing** – Run deep‑learning models on‑edge; update them OTA.  
         * **Virtualisation & Multi‑OS** – Run Linux + QNX containers side‑by‑side, each isolated but sharing the same hardware.  
         * **Homologation – Today vs OTA** – Traditional certification freezes the software at launch; OTA‑enabled vehicles must also certify the **update process** (secure boot, signed images, rollback).  
-        """
-    )
-    st.subheader("🗂️ Additional reading (short list)")
-    st.markdown(
-        """
+        """),
+    ("🗂️ Additional reading (short list)",
+     """
         * AUTOSAR Adaptive Platform – https://www.autosar.org/standards/adaptive/  
         * ISO 26262 – Road vehicles – Functional safety.  
         * SAE 21434 – Cybersecurity engineering for vehicles.  
         * “Time‑Sensitive Networking” – IEEE 802.1TSN.  
         * “Software‑Defined Vehicles – The Next Generation” – IEEE Tech. 
-        """
-    )
+        """),
+)
+
+def docs_page():
+    st.header("📖 Documentation – All SDV Topics")
+    for title, md in _DOCS_SECTIONS:
+        st.subheader(title)
+        st.markdown(md)
     st.info("All the theory above is linked to the interactive pages – jump to *Developer Playground*, *V&V Engineer*, *ADAS*, *Inside View* or *Infotainment & OTA* to see the concepts in action.")
 
 # ------------------------------------------------------------------
-# 18️⃣  Navigation setup (sidebar)
+# ECU Monitor panel
 # ------------------------------------------------------------------
-st.set_page_config(page_title="SDV Full Demo", layout="wide", page_icon="🚗")
-st.title("🚗 Software‑Defined Vehicle – Full Demo & Knowledge Hub")
-st.caption(
-    "Hands‑on playground **+** theory pages covering the entire SDV ecosystem."
-)
-
-nav_options = {
-    "🏠 Overview": "overview",
-    "👨‍💻 Developer Playground": "developer",
-    "🔧 V&V Engineer": "vver",
-    "🔄 SIL & Virtualisation": "sil",
-    "🧭 ADAS": "adas",
-    "🚗 Inside View": "interior",
-    "📱 Infotainment & OTA": "infotainment_ota",
-    "🧩 Scenarios & Report": "scenarios",
-    "🛒 Play Store": "playstore",
-    "📱 Installed Apps": "installed",
-    "🕹️ Driving Dashboard": "drive",
-    "🧠 ECU Monitor": "ecu",
-    "🔮 Predictive": "predict",
-    "🗺️ Architecture Evolution": "arch",
-    "🎯 Missions": "missions",
-    "📖 Docs": "docs",
-}
-choice = st.sidebar.radio("Select section", list(nav_options.keys()))
-view = nav_options[choice]
-
-# Load / init the global state once for the whole session
-state = load_state()
-app_mgr = ApplicationManager(state)
-telemetry_source = TelemetrySource()
-pm = PredictiveMaintenance()
+def _ecu_panel():
+    ecu = compute_ecu_snapshot()
+    meta, bcm, bms, tcu, adas = (ecu["meta"], ecu["BCM"], ecu["BMS"],
+                                 ecu["TCU"], ecu["ADAS"])
+    soc_txt = _F1(bms["soc"]) + " %"
+    st.metric("Vehicle speed", _F1(meta["speed"]) + " km/h")
+    st.metric("Mode", meta["mode"])
+    st.metric("SOC", soc_txt)
+    st.markdown("---")
+    c1,c2 = st.columns(2)
+    with c1:
+        with st.expander("🚗 BCM – Body Control Module", expanded=True):
+            st.metric("Headlights", "ON" if bcm["headlights_on"] else "OFF")
+            st.metric("Doors locked", "Locked" if bcm["doors_locked"] else "Unlocked")
+            st.metric("Cabin temp (°C)", _F1(bcm["cabin_temp"]))
+    with c2:
+        with st.expander("🔋 BMS – Battery Management System", expanded=True):
+            st.metric("SOC", soc_txt)
+            st.metric("Battery temp (°C)", _F1(bms["temp"]))
+            st.metric("Cycles", bms["cycles"])
+            st.metric("SOH", _F1(bms["soh"]) + " %")
+            st.metric("Status", bms["status"])
+    c3,c4 = st.columns(2)
+    with c3:
+        with st.expander("📡 TCU – Telematics Control Unit", expanded=True):
+            st.metric("Network", tcu["network_status"])
+            st.metric("Signal strength", tcu["signal_strength"])
+            st.metric("GPS fix", tcu["gps_fix"])
+    with c4:
+        with st.expander("🧭 ADAS – Driver Assistance", expanded=True):
+            st.metric("Lane offset (m)", _FP2(adas["lane_offset"]))
+            st.metric("Lane departure", "YES" if adas["lane_departure"] else "NO")
+            st.metric("Obstacle distance (m)", _F1(adas["obstacle_distance"]))
+            st.metric("Collision warn", "⚠️" if adas["collision_warn"] else "OK")
 
 # ------------------------------------------------------------------
-# Page dispatch
+# 17️⃣b  Original pages (Play Store … Missions)
 # ------------------------------------------------------------------
-if view == "overview":
-    overview_page()
-elif view == "developer":
-    developer_playground()
-elif view == "vver":
-    vver_page()
-elif view == "sil":
-    sil_virtualization_demo()
-elif view == "adas":
-    adas_page()
-elif view == "interior":
-    interior_view_page()
-elif view == "infotainment_ota":
-    infotainment_ota_page()
-elif view == "scenarios":
-    scenarios_page()
-elif view == "playstore":
+def playstore_page():
     # ---- Play Store (original) ----
     st.header("🛒 Play Store – Install Demo Apps")
     cols = st.columns(3)
-    installed_ids = {a["id"] for a in app_mgr.list_apps()}
+    installed_ids = app_mgr.installed_id_set()
     for i, app in enumerate(STORE_APPS):
         with cols[i % 3]:
-            st.markdown(
-                f"""
-                <div class="app-card" style="border:1px solid #e5e7eb;
-                     border-radius:10px; padding:8px; margin-bottom:8px;
-                     background:#fff;">
-                  <div style="display:flex; align-items:center;">
-                    <span style="font-size:1.4rem; margin-right:6px;">{app['icon']}</span>
-                    <strong>{app['name']}</strong>
-                  </div>
-                  <p style="font-size:0.85rem; color:#555;">{app['description']}</p>
-                  <small>v{app['version']}</small>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(_STORE_CARD_HTML[app["id"]], unsafe_allow_html=True)
             if app["id"] in installed_ids:
                 st.button("Installed ✓", key=f"ps_{app['id']}", disabled=True)
             else:
@@ -1533,7 +1833,7 @@ elif view == "playstore":
                     else:
                         st.error(msg)
 
-elif view == "installed":
+def installed_apps_page():
     # ---- Installed Apps (original) ----
     st.header("📱 Installed Applications")
     apps = app_mgr.list_apps()
@@ -1543,19 +1843,8 @@ elif view == "installed":
         cols = st.columns(3)
         for i, app in enumerate(apps):
             with cols[i % 3]:
-                st.markdown(
-                    f"""
-                    <div class="app-card" style="border:1px solid #e5e7eb;
-                         border-radius:10px; padding:8px; margin-bottom:8px;
-                         background:#fff;">
-                      <div style="display:flex; align-items:center;">
-                        <span style="font-size:1.4rem; margin-right:6px;">{app.get('icon','📦')}</span>
-                        <strong>{app.get('name','App')}</strong>
-                      </div>
-                      <p style="font-size:0.85rem; color:#555;">{app.get('description','')}</p>
-                      <small>v{app.get('version','')}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.markdown(_CARD_TPL.format_map({**_CARD_DEFAULTS, **app}),
+                            unsafe_allow_html=True)
                 c_un, c_up = st.columns(2)
                 with c_un:
                     if st.button("Uninstall", key=f"un_{app['id']}"):
@@ -1574,7 +1863,7 @@ elif view == "installed":
                         else:
                             st.error(info)
 
-elif view == "drive":
+def driving_dashboard_page():
     # ---- Driving Dashboard (original) ----
     st.header("🕹️ Driving Dashboard")
     left, right = st.columns([2, 1])
@@ -1592,34 +1881,35 @@ elif view == "drive":
                                       brake_pct=brake,
                                       dt_seconds=dt,
                                       mode=mode)
-            st.json(row)
+            st.json(dict(row, timestamp=_iso(row["timestamp_ns"])))
 
         if st.button("Run"):
             prog = st.progress(0)
+            # step a plain dict, write back to session_state once at the end
+            sim = {k: st.session_state[k]
+                   for k in ("drive", "drive_log_cols", "drive_tick")
+                   if k in st.session_state}
+            every = max(1, steps // 25)
             for i in range(steps):
-                simulate_drive_step(st.session_state,
+                simulate_drive_step(sim,
                                    throttle_pct=throttle,
                                    brake_pct=brake,
                                    dt_seconds=dt,
                                    mode=mode)
-                prog.progress(int((i+1)/steps*100))
-                time.sleep(max(0.01, dt/5.0))
+                if (i + 1) % every == 0 or i + 1 == steps:
+                    prog.progress(int((i+1)/steps*100))
+            st.session_state.update(sim)
             st.success(f"Ran {steps} steps")
 
     with right:
-        drv = st.session_state.get(
-            "drive",
-            {"speed":0.0,"soc":95.0,"temperature":30.0,"mode":"Normal"},
-        )
+        drv = st.session_state.get("drive", _DRIVE_DEFAULT)
         st.metric("Speed", f"{drv['speed']:.1f} km/h")
         st.metric("SOC", f"{drv['soc']:.2f} %")
         st.metric("Temp", f"{drv['temperature']:.1f} °C")
         st.metric("Mode", drv["mode"])
 
-    log_df = pd.DataFrame(st.session_state.get("drive_log", []))
+    log_df = _drive_log_df()
     if not log_df.empty:
-        log_df["timestamp"] = pd.to_datetime(log_df["timestamp"])
-        log_df = log_df.set_index("timestamp")
         tab_chart, tab_table = st.tabs(["📈 Telemetry charts", "📋 Recent rows"])
         with tab_chart:
             cols_chart = [c for c in ["speed","soc","temperature"] if c in log_df.columns]
@@ -1630,47 +1920,23 @@ elif view == "drive":
     else:
         st.info("No drive data yet – press **Step** or **Run** above.")
 
-elif view == "ecu":
+def ecu_monitor_page():
     # ---- ECU Monitor (original) ----
     st.header("🧠 ECU Monitor")
-    ecu = compute_ecu_snapshot()
-    meta = ecu["meta"]
-    st.metric("Vehicle speed", f"{meta['speed']:.1f} km/h")
-    st.metric("Mode", meta["mode"])
-    st.metric("SOC", f"{ecu['BMS']['soc']:.1f} %")
-    st.markdown("---")
-    c1,c2 = st.columns(2)
-    with c1:
-        with st.expander("🚗 BCM – Body Control Module", expanded=True):
-            bcm = ecu["BCM"]
-            st.metric("Headlights", "ON" if bcm["headlights_on"] else "OFF")
-            st.metric("Doors locked", "Locked" if bcm["doors_locked"] else "Unlocked")
-            st.metric("Cabin temp (°C)", f"{bcm['cabin_temp']:.1f}")
-    with c2:
-        with st.expander("🔋 BMS – Battery Management System", expanded=True):
-            bms = ecu["BMS"]
-            st.metric("SOC", f"{bms['soc']:.1f} %")
-            st.metric("Battery temp (°C)", f"{bms['temp']:.1f}")
-            st.metric("Cycles", bms["cycles"])
-            st.metric("SOH", f"{bms['soh']:.1f} %")
-            st.metric("Status", bms["status"])
-    c3,c4 = st.columns(2)
-    with c3:
-        with st.expander("📡 TCU – Telematics Control Unit", expanded=True):
-            tcu = ecu["TCU"]
-            st.metric("Network", tcu["network_status"])
-            st.metric("Signal strength", tcu["signal_strength"])
-            st.metric("GPS fix", tcu["gps_fix"])
-    with c4:
-        with st.expander("🧭 ADAS – Driver Assistance", expanded=True):
-            adas = ecu["ADAS"]
-            st.metric("Lane offset (m)", f"{adas['lane_offset']:+.2f}")
-            st.metric("Lane departure", "YES" if adas["lane_departure"] else "NO")
-            st.metric("Obstacle distance (m)", f"{adas['obstacle_distance']:.1f}")
-            st.metric("Collision warn", "⚠️" if adas["collision_warn"] else "OK")
+    _ecu_panel()
     st.info("All values are synthetic and derived from the same drive model.")
 
-elif view == "predict":
+# identical Generate / Fetch clicks are served from the cache
+@st.cache_data(ttl=300, show_spinner=False)
+def _simulate_telemetry(hours, freq_minutes, seed):
+    return telemetry_source.simulate(hours=hours, freq_minutes=freq_minutes, seed=seed)
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _fetch_mqtt_mock():
+    telemetry_source.start_mock_mqtt_publish()
+    return telemetry_source.read_mock_mqtt_latest()
+
+def predictive_page():
     # ---- Predictive Maintenance (original) ----
     st.header("🔮 Predictive Maintenance – Battery health")
     source = st.selectbox("Telemetry source", ["Simulate","Load CSV","Mock MQTT","Driving Log"])
@@ -1680,28 +1946,47 @@ elif view == "predict":
         freq = st.selectbox("Sample interval (min)", [5,15,30,60], index=1)
         seed = st.number_input("Seed", value=42)
         if st.button("Generate"):
-            df = telemetry_source.simulate(hours=hrs, freq_minutes=freq, seed=int(seed))
-            st.session_state["telemetry"] = df.to_dict("records")
+            df = _simulate_telemetry(hrs, freq, int(seed))
+            st.session_state["telemetry_df"] = df
             st.rerun()
     elif source == "Load CSV":
         uploaded = st.file_uploader("Upload CSV", type=["csv"])
-        if uploaded:
-            df = telemetry_source.read_can_csv(uploaded)
-            st.session_state["telemetry"] = df.to_dict("records")
-            st.rerun()
+        # the uploader keeps returning the file on every rerun – only a
+        # newly uploaded file should replace the telemetry and rerun
+        if uploaded and st.session_state.get("_telemetry_file") != uploaded.file_id:
+            st.session_state["_telemetry_file"] = uploaded.file_id
+            try:
+                df = telemetry_source.read_can_csv(uploaded)
+            except ValueError as e:   # non-numeric cell in a typed column
+                st.error(f"Could not parse CSV: {e}")
+                df = None
+            else:
+                st.session_state["telemetry_df"] = df
+                st.rerun()
     elif source == "Mock MQTT":
         if st.button("Fetch MQTT mock"):
-            telemetry_source.start_mock_mqtt_publish()
-            df = telemetry_source.read_mock_mqtt_latest()
-            st.session_state["telemetry"] = df.to_dict("records")
+            df = _fetch_mqtt_mock()
+            st.session_state["telemetry_df"] = df
             st.rerun()
     else:  # Driving Log
-        if st.session_state.get("drive_log"):
-            dl = pd.DataFrame(st.session_state["drive_log"])
-            dl["voltage"] = 350 + (dl["soc"]/100)*60 + np.random.normal(0,0.2,len(dl))
+        if st.session_state.get("drive_log_cols"):
+            dl = pd.DataFrame(st.session_state["drive_log_cols"])
+            dl["timestamp"] = _ns_to_datetime(dl["timestamp_ns"])
+            # voltage = 350 + soc/100·60 + N(0, 0.2), built in one buffer
+            n = len(dl)
+            v = np.divide(dl["soc"].to_numpy(), 100.0, out=np.empty(n))
+            v *= 60.0
+            v += 350.0
+            noise = _NOISE_RNG.standard_normal(n)
+            noise *= 0.2
+            v += noise
+            dl["voltage"] = v
             df = dl[["timestamp","voltage","temperature","cycles"]]
         else:
             st.info("No drive log – run the Driving Dashboard first.")
+    if df is None and source != "Driving Log":
+        # kept as a DataFrame – no records round-trip per refresh
+        df = st.session_state.get("telemetry_df")
 
     if df is not None and not df.empty:
         df["timestamp"] = pd.to_datetime(df["timestamp"])
@@ -1722,61 +2007,83 @@ elif view == "predict":
     else:
         st.info("No telemetry loaded yet.")
 
-elif view == "arch":
+# the graph is static – build it once per server process
+@st.cache_resource(show_spinner=False)
+def _arch_graph():
+    return draw_arch_evolution()
+
+def architecture_page():
     st.header("🗺️ Architecture Evolution")
-    st.graphviz_chart(draw_arch_evolution())
+    st.graphviz_chart(_arch_graph())
     st.markdown(
         """
         The path **UNO → DUO → Ethernet‑TSN → Service‑Based** is the typical migration many OEMs follow today.
         """
     )
 
-elif view == "missions":
+# ---- Mission definitions (copy‑paste from the original script) ----
+_MISSIONS = [
+    {
+        "id":"m1",
+        "title":"Mission 1 – Install & OTA an app",
+        "steps":"1) Play Store → install EcoDrive & Battery.\n2) Installed Apps → OTA‑update EcoDrive.\n3) Infotainment → verify version bump.",
+        "badge":"ota_expert"
+    },
+    {
+        "id":"m2",
+        "title":"Mission 2 – Eco vs Sport battery impact",
+        "steps":"1) Driving Dashboard → Eco mode, throttle 40 %, run 40 steps.\n2) Record SOC.\n3) Switch to Sport, same throttle, run 40 steps.\n4) Compare SOC drop.",
+        "badge":"eco_champion"
+    },
+    {
+        "id":"m3",
+        "title":"Mission 3 – ADAS lane‑departure demo",
+        "steps":"1) Drive in mixed mode for ~80 steps.\n2) Open ECU Monitor → ADAS.\n3) Observe lane‑offset & departure warnings.",
+        "badge":"adas_specialist"
+    },
+    {
+        "id":"m4",
+        "title":"Mission 4 – Predictive battery risk",
+        "steps":"1) Drive Eco + Sport (≥60 steps total).\n2) Predictive → use Driving Log.\n3) View risk score & component breakdown.",
+        "badge":"battery_guru"
+    },
+    # Add m5‑m9 if you want – they were in the original script.
+]
+# markdown for each mission's step list (hard line breaks), built once
+for m in _MISSIONS:
+    m["_steps_md"] = "**Steps**:\n" + m["steps"].replace("\n", "  \n")
+del m
+
+_BADGE_NAMES = {
+    "eco_champion":"🌱 Eco Champion",
+    "ota_expert":"⬆️ OTA Expert",
+    "adas_specialist":"🚦 ADAS Specialist",
+    "battery_guru":"🔋 Battery Guru",
+    "drive_master":"🚗 Drive Master",
+    "data_analyst":"📊 Data Analyst",
+    "fleet_engineer":"🛠️ Fleet Engineer",
+}
+_BADGE_EMIT = {True: st.success, False: st.info}
+
+def missions_page():
     # ---- Missions & Badges (unchanged – copy the block from the previous version) ----
     st.header("🎯 SDV Missions & Badges")
     st.caption("Hands‑on challenges for learners.")
-    # ---- Mission definitions (copy‑paste from the original script) ----
-    missions = [
-        {
-            "id":"m1",
-            "title":"Mission 1 – Install & OTA an app",
-            "steps":"1) Play Store → install EcoDrive & Battery.\n2) Installed Apps → OTA‑update EcoDrive.\n3) Infotainment → verify version bump.",
-            "badge":"ota_expert"
-        },
-        {
-            "id":"m2",
-            "title":"Mission 2 – Eco vs Sport battery impact",
-            "steps":"1) Driving Dashboard → Eco mode, throttle 40 %, run 40 steps.\n2) Record SOC.\n3) Switch to Sport, same throttle, run 40 steps.\n4) Compare SOC drop.",
-            "badge":"eco_champion"
-        },
-        {
-            "id":"m3",
-            "title":"Mission 3 – ADAS lane‑departure demo",
-            "steps":"1) Drive in mixed mode for ~80 steps.\n2) Open ECU Monitor → ADAS.\n3) Observe lane‑offset & departure warnings.",
-            "badge":"adas_specialist"
-        },
-        {
-            "id":"m4",
-            "title":"Mission 4 – Predictive battery risk",
-            "steps":"1) Drive Eco + Sport (≥60 steps total).\n2) Predictive → use Driving Log.\n3) View risk score & component breakdown.",
-            "badge":"battery_guru"
-        },
-        # Add m5‑m9 if you want – they were in the original script.
-    ]
-
-    for m in missions:
+    missions, badges = state["missions"], state["badges"]
+    for m in _MISSIONS:
+        mid = m["id"]
+        done = missions.get(mid, False)
         st.markdown("---")
         col_chk, col_body = st.columns([0.07, 0.93])
         with col_chk:
-            st.checkbox(" ", value=state["missions"].get(m["id"], False),
-                         key=f"chk_{m['id']}", disabled=True)
+            st.markdown("✅" if done else "⬜")   # read-only indicator, no widget
         with col_body:
             st.subheader(m["title"])
-            st.markdown(f"**Steps**:\n{m['steps'].replace('\n','  \n')}")
-            if not state["missions"].get(m["id"], False):
-                if st.button(f"Mark `{m['title']}` as completed", key=f"b_{m['id']}"):
-                    state["missions"][m["id"]] = True
-                    state["badges"][m["badge"]] = True
+            st.markdown(m["_steps_md"])
+            if not done:
+                if st.button(f"Mark `{m['title']}` as completed", key=f"b_{mid}"):
+                    missions[mid] = True
+                    badges[m["badge"]] = True
                     save_state(state)
                     st.success("✅ Mission completed – badge unlocked!")
                     st.rerun()
@@ -1785,27 +2092,67 @@ elif view == "missions":
 
     st.markdown("---")
     st.subheader("🛡️ Your Badges")
-    badge_names = {
-        "eco_champion":"🌱 Eco Champion",
-        "ota_expert":"⬆️ OTA Expert",
-        "adas_specialist":"🚦 ADAS Specialist",
-        "battery_guru":"🔋 Battery Guru",
-        "drive_master":"🚗 Drive Master",
-        "data_analyst":"📊 Data Analyst",
-        "fleet_engineer":"🛠️ Fleet Engineer",
-    }
-    cols = st.columns(4)
-    for i, (bid, unlocked) in enumerate(state["badges"].items()):
-        with cols[i%4]:
-            if unlocked:
-                st.success(badge_names[bid])
-            else:
-                st.info(badge_names[bid])
+    # one container context per column instead of one per badge
+    items = list(badges.items())
+    for c_idx, col in enumerate(st.columns(4)):
+        with col:
+            for bid, unlocked in items[c_idx::4]:
+                _BADGE_EMIT[unlocked](_BADGE_NAMES[bid])
 
-elif view == "docs":
-    docs_page()
-else:
-    st.error("Unknown page – something went wrong.")
+# ------------------------------------------------------------------
+# 18️⃣  Navigation setup (sidebar)
+# ------------------------------------------------------------------
+st.set_page_config(page_title="SDV Full Demo", layout="wide", page_icon="🚗")
+st.title("🚗 Software‑Defined Vehicle – Full Demo & Knowledge Hub")
+st.caption(
+    "Hands‑on playground **+** theory pages covering the entire SDV ecosystem."
+)
+
+# service objects survive reruns instead of being rebuilt by every script run
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _app_manager_for(state_id, _state):
+    # keyed on the state dict's identity: load_state() hands out a new dict
+    # only after the file changed on disk
+    return ApplicationManager(_state)
+
+@st.cache_resource(show_spinner=False)
+def _predictive_maintenance():
+    return PredictiveMaintenance()    # stateless, shared
+
+# sidebar label → page renderer
+nav_options = {
+    "🏠 Overview": overview_page,
+    "👨‍💻 Developer Playground": developer_playground,
+    "🔧 V&V Engineer": vver_page,
+    "🔄 SIL & Virtualisation": sil_virtualization_demo,
+    "🧭 ADAS": adas_page,
+    "🚗 Inside View": interior_view_page,
+    "📱 Infotainment & OTA": infotainment_ota_page,
+    "🧩 Scenarios & Report": scenarios_page,
+    "🛒 Play Store": playstore_page,
+    "📱 Installed Apps": installed_apps_page,
+    "🕹️ Driving Dashboard": driving_dashboard_page,
+    "🧠 ECU Monitor": ecu_monitor_page,
+    "🔮 Predictive": predictive_page,
+    "🗺️ Architecture Evolution": architecture_page,
+    "🎯 Missions": missions_page,
+    "📖 Docs": docs_page,
+}
+choice = st.sidebar.radio("Select section", list(nav_options.keys()))
+render_page = nav_options[choice]
+
+# Load / init the global state once for the whole session
+state = load_state()
+app_mgr = _app_manager_for(id(state), state)
+if "telemetry_source" not in st.session_state:   # per session – owns reusable buffers
+    st.session_state["telemetry_source"] = TelemetrySource()
+telemetry_source = st.session_state["telemetry_source"]
+pm = _predictive_maintenance()
+
+# ------------------------------------------------------------------
+# Page dispatch
+# ------------------------------------------------------------------
+render_page()
 
 # ------------------------------------------------------------------
 # End of file